@@ -7,27 +7,186 @@ content hash, file size, name, and metadata.
 
 import os
 import sys
+import errno
 import hashlib
 import argparse
 import shutil
+import queue
+import sqlite3
+import threading
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from contextlib import ExitStack
 from datetime import datetime
 import mimetypes
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Content hash algorithms, mapped to the package that provides them
+HASH_ALGORITHM_PACKAGES = {
+    "sha256": "hashlib",
+    "blake3": "blake3",
+    "xxh3": "xxhash",
+}
+
+# Hasher factories for the algorithms whose package is importable
+HASH_ALGORITHMS = {"sha256": hashlib.sha256}
+if blake3 is not None:
+    HASH_ALGORITHMS["blake3"] = blake3.blake3
+if xxhash is not None:
+    HASH_ALGORITHMS["xxh3"] = xxhash.xxh3_128
+
+# Linux ioctl that makes a file share another file's extents (a reflink)
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+# Number of leading bytes hashed to split same-size groups before full hashing;
+# for files no larger than this the head hash is the full content hash
+HEAD_HASH_SIZE = 4096
+
+# Files up to this size are hashed from a single read
+SMALL_FILE_SIZE = 256 * 1024
+
+# Block size for hashing larger files where hashlib.file_digest is unavailable
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Number of same-size small files hashed per thread pool task
+HASH_BATCH_SIZE = 8
+
+# Block size and number of files compared at once when verifying byte-by-byte
+VERIFY_BLOCK_SIZE = 1024 * 1024
+VERIFY_BATCH_SIZE = 64
+
+
+def advise_file(f, advice):
+    """Give the kernel an access pattern hint for an open file, where supported"""
+    # advice is the name of an os.POSIX_FADV_* constant, which only exist on
+    # platforms that have posix_fadvise
+    advice_value = getattr(os, advice, None)
+    if advice_value is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(f.fileno(), 0, 0, advice_value)
+    except OSError:
+        pass
+
+
+def read_file_prefix(path, length):
+    """Read up to length bytes from the start of a file"""
+    # A bare open/read/close skips the fstat and lseek calls that building a
+    # file object costs, which dominate when hashing many small files
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, length)
+    finally:
+        os.close(fd)
+
+
+def clone_file(source, destination):
+    """
+    Create destination as a copy-on-write clone of source, where supported
+
+    Returns:
+        True if the clone was created, False if the caller should copy instead
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+
+    created = False
+    try:
+        with open(source, "rb") as src, open(destination, "xb") as dst:
+            created = True
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        # Different filesystems, or one without reflink support
+        if created:
+            os.unlink(destination)
+        return False
+
+
+def get_worker_count(env_var, default):
+    """Number of worker threads, overridable via the given environment variable"""
+    workers = os.environ.get(env_var)
+    if workers:
+        try:
+            return max(1, int(workers))
+        except ValueError:
+            print(f"Warning: Ignoring invalid {env_var} value '{workers}'")
+    return default
+
+
+def get_hash_workers():
+    """Number of threads used for hashing, overridable via DUPEFINDER_HASH_WORKERS"""
+    return get_worker_count("DUPEFINDER_HASH_WORKERS", os.cpu_count() or 1)
+
+
+def get_scan_workers():
+    """Number of threads used for scanning, overridable via DUPEFINDER_SCAN_WORKERS"""
+    return get_worker_count("DUPEFINDER_SCAN_WORKERS", (os.cpu_count() or 1) * 2)
+
 
 class FileInfo:
     """Class to store file information for comparison"""
 
-    def __init__(self, filepath):
-        self.path = Path(filepath)
-        self.size = self.path.stat().st_size
-        self.name = self.path.name
-        self.stem = self.path.stem
-        self.suffix = self.path.suffix
-        self.modified_time = self.path.stat().st_mtime
-        self.mime_type = mimetypes.guess_type(str(self.path))[0]
+    # One instance exists per scanned file, so skip the per-instance __dict__
+    __slots__ = ('path_str', 'size', 'name', 'modified_time', 'cache_key',
+                 'hash_algo', '_hash', '_head_hash')
+
+    def __init__(self, filepath, hash_algo="sha256", stat_result=None, cacheable=False):
+        # Kept as a plain string; a Path is only built when displaying or moving
+        self.path_str = os.fspath(filepath)
+        # Scanners pass the DirEntry's stat result so each file is stat()ed once
+        st = stat_result if stat_result is not None else os.stat(self.path_str)
+        self.size = st.st_size
+        self.name = os.path.basename(self.path_str)
+        self.modified_time = st.st_mtime
+        # Identifies this version of the file in the hash cache, and is only
+        # built when a cache is in use. ctime is included because, unlike
+        # mtime, it cannot be restored from user space after an in-place
+        # edit. Platforms whose stat results carry no inode number cannot be
+        # cached safely.
+        self.cache_key = None
+        if cacheable and st.st_ino:
+            self.cache_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+        self.hash_algo = hash_algo
         self._hash = None
+        self._head_hash = None
+
+    @property
+    def path(self):
+        """Path object for the file, built on access"""
+        return Path(self.path_str)
+
+    @property
+    def stem(self):
+        """Filename without extension, derived on access"""
+        return os.path.splitext(self.name)[0]
+
+    @property
+    def suffix(self):
+        """File extension, derived on access"""
+        return os.path.splitext(self.name)[1]
+
+    @property
+    def mime_type(self):
+        """MIME type guessed from the filename, looked up only when displayed"""
+        return mimetypes.guess_type(self.path_str)[0]
 
     @property
     def hash(self):
@@ -36,27 +195,221 @@ class FileInfo:
             self._hash = self._calculate_hash()
         return self._hash
 
+    @property
+    def head_hash(self):
+        """Lazy computation of the hash of the first HEAD_HASH_SIZE bytes"""
+        if self._head_hash is None:
+            self._head_hash = self._calculate_head_hash()
+        return self._head_hash
+
     def _calculate_hash(self):
-        """Calculate SHA256 hash of file content"""
-        hash_sha256 = hashlib.sha256()
+        """Calculate hash of file content using the configured algorithm"""
+        new_hasher = HASH_ALGORITHMS[self.hash_algo]
         try:
-            with open(self.path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            if self.size <= SMALL_FILE_SIZE:
+                # Ask for one byte more than expected: a short read means the
+                # whole file was read, otherwise it grew since it was scanned
+                data = read_file_prefix(self.path_str, self.size + 1)
+                if len(data) <= self.size:
+                    return new_hasher(data).hexdigest()
+
+            with open(self.path_str, "rb", buffering=0) as f:
+                # Larger files are read once front to back: ask for aggressive
+                # readahead, then drop their pages so a tree-wide run does not
+                # evict everything else from the page cache
+                advise_file(f, "POSIX_FADV_SEQUENTIAL")
+                try:
+                    return self._digest_large_file(f, new_hasher)
+                finally:
+                    advise_file(f, "POSIX_FADV_DONTNEED")
         except (IOError, OSError) as e:
-            print(f"Warning: Could not read {self.path}: {e}")
+            print(f"Warning: Could not read {self.path_str}: {e}")
             return None
 
+    def _digest_large_file(self, f, new_hasher):
+        """Hash an open file too large for a single read"""
+        # Files are read rather than memory-mapped so one truncated while it
+        # is hashed gives a short read instead of SIGBUS; Python 3.11+ runs
+        # the whole read/update loop in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, new_hasher).hexdigest()
+
+        hasher = new_hasher()
+        buffer = bytearray(HASH_BLOCK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            hasher.update(view[:n])
+        return hasher.hexdigest()
+
+    def _calculate_head_hash(self):
+        """Calculate hash of the first HEAD_HASH_SIZE bytes of the file"""
+        new_hasher = HASH_ALGORITHMS[self.hash_algo]
+        try:
+            # One extra byte tells whether the head is the whole file, in
+            # which case it is also the full content hash
+            data = read_file_prefix(self.path_str, HEAD_HASH_SIZE + 1)
+            head_hash = new_hasher(data[:HEAD_HASH_SIZE]).hexdigest()
+            # A freshly read whole file also overrides a cached full hash
+            if len(data) <= HEAD_HASH_SIZE:
+                self._hash = head_hash
+            return head_hash
+        except (IOError, OSError) as e:
+            print(f"Warning: Could not read {self.path_str}: {e}")
+            # False rather than None so the failure is remembered and the
+            # file is not read (and reported) again
+            return False
+
+
+class HashCache:
+    """Persistent store of content hashes keyed by file identity, mtime and ctime"""
+
+    def __init__(self, cache_path):
+        cache_path = os.path.expanduser(cache_path)
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Rows from the earlier layout lack ctime and cannot be validated
+        self._conn.execute("DROP TABLE IF EXISTS hashes")
+        # One row per file and algorithm; a changed size, mtime or ctime replaces it
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "dev INTEGER, ino INTEGER, algo TEXT, size INTEGER, mtime_ns INTEGER, "
+            "ctime_ns INTEGER, hash TEXT NOT NULL, PRIMARY KEY (dev, ino, algo))"
+        )
+        self._conn.commit()
+
+    def load(self, file_infos):
+        """
+        Fill in cached hashes for files whose size, mtime and ctime are unchanged
+
+        Args:
+            file_infos: FileInfo objects to look up
+
+        Returns:
+            List of the FileInfo objects that were not found in the cache
+        """
+        misses = []
+        for file_info in file_infos:
+            row = None
+            if file_info.cache_key is not None and file_info._hash is None:
+                dev, ino, size, mtime_ns, ctime_ns = file_info.cache_key
+                row = self._conn.execute(
+                    "SELECT hash FROM file_hashes WHERE dev=? AND ino=? AND algo=? "
+                    "AND size=? AND mtime_ns=? AND ctime_ns=?",
+                    (dev, ino, file_info.hash_algo, size, mtime_ns, ctime_ns)
+                ).fetchone()
+            if row:
+                file_info._hash = row[0]
+            else:
+                misses.append(file_info)
+        return misses
+
+    def store(self, file_infos):
+        """Save the computed hashes of file_infos in a single transaction"""
+        rows = []
+        for file_info in file_infos:
+            if file_info.cache_key is None or not file_info._hash:
+                continue
+            dev, ino, size, mtime_ns, ctime_ns = file_info.cache_key
+            rows.append((dev, ino, file_info.hash_algo, size, mtime_ns, ctime_ns,
+                         file_info._hash))
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes "
+                "(dev, ino, algo, size, mtime_ns, ctime_ns, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+
+
+class ProgressReporter:
+    """Prints a progress counter from a background thread at a limited rate"""
+
+    def __init__(self, total, interval=0.1):
+        self.total = total
+        self.done = 0
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stopped.set()
+        self._thread.join()
+        self._show()
+
+    def update(self, count=1):
+        """Record count more completed items; safe to call from any thread"""
+        with self._lock:
+            self.done += count
+
+    def _run(self):
+        shown = None
+        while not self._stopped.wait(self._interval):
+            if self.done != shown:
+                shown = self.done
+                self._show()
+
+    def _show(self):
+        sys.stdout.write(f"\rProgress: {self.done}/{self.total}")
+        sys.stdout.flush()
+
 
 class DuplicateFinder:
     """Main class for finding duplicate files"""
 
-    def __init__(self):
+    def __init__(self, hash_algo="sha256", cache_path=None):
         self.files = []
+        self.hash_algo = hash_algo
+        self.cache = None
+        if cache_path:
+            try:
+                self.cache = HashCache(cache_path)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Warning: Could not open hash cache {cache_path}: {e}")
+
+    def close(self):
+        """Release the hash cache, if one is open"""
+        if self.cache is not None:
+            try:
+                self.cache.close()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not close hash cache: {e}")
+            self.cache = None
+
+    def _disable_cache(self, error):
+        """Stop using the hash cache for the rest of the run after an error"""
+        # The cache only saves work, so a failing database must not lose
+        # the hashes computed in this run
+        print(f"Warning: Hash cache unavailable, continuing without it: {error}")
+        self.close()
 
     def scan_directory(self, directory, recursive=True, file_types=None):
         """Scan directory for files"""
+        for file_path, stat_result in self.iter_files(directory, recursive, file_types):
+            self._process_file(file_path, stat_result)
+
+        # Parallel scanning yields files in no fixed order; sort so that
+        # reports and the file kept by --move-to are stable between runs
+        self.files.sort(key=attrgetter("path_str"))
+
+    def iter_files(self, directory, recursive=True, file_types=None):
+        """Yield (path, stat result) pairs of matching files as the directory tree is walked"""
         path = Path(directory)
         if not path.exists():
             print(f"Error: Directory '{directory}' does not exist")
@@ -66,99 +419,282 @@ class DuplicateFinder:
             print(f"Error: '{directory}' is not a directory")
             return
 
-        pattern = "**/*" if recursive else "*"
+        # Normalize the extension filter once so each file costs a set lookup
+        if file_types:
+            file_types = frozenset(ext.lower() for ext in file_types)
 
-        try:
-            for file_path in path.glob(pattern):
-                if file_path.is_file():
-                    # Filter by file types if specified
-                    if file_types:
-                        if not any(file_path.suffix.lower() == ext.lower() for ext in file_types):
-                            continue
+        workers = get_scan_workers() if recursive else 1
+        if workers > 1:
+            yield from self._iter_files_parallel(str(path), file_types, workers)
+            return
+
+        stack = [str(path)]
+        while stack:
+            subdirs, files = self._scan_single_directory(stack.pop(), recursive, file_types)
+            stack.extend(subdirs)
+            yield from files
+
+    def _iter_files_parallel(self, root, file_types, workers):
+        """Walk the tree with a pool of threads sharing a queue of pending directories"""
+        pending = queue.Queue()
+        results = queue.Queue()
+
+        def worker():
+            while True:
+                directory = pending.get()
+                if directory is None:
+                    return
+                try:
+                    results.put(self._scan_single_directory(directory, True, file_types))
+                except Exception as e:
+                    print(f"Warning: Could not scan directory {directory}: {e}")
+                    results.put(([], []))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(worker)
 
+            # Directories queued but not yet reported back; the walk is done
+            # once every queued directory has been scanned
+            outstanding = 1
+            pending.put(root)
+            try:
+                while outstanding:
+                    subdirs, files = results.get()
+                    outstanding += len(subdirs) - 1
+                    for subdir in subdirs:
+                        pending.put(subdir)
+                    yield from files
+            finally:
+                # Drop unscanned directories if the consumer stopped early
+                while True:
                     try:
-                        file_info = FileInfo(file_path)
-                        self.files.append(file_info)
-                    except (OSError, IOError) as e:
-                        print(f"Warning: Could not process {file_path}: {e}")
-        except (OSError, IOError, PermissionError) as e:
-            print(f"Warning: Error scanning directory structure: {e}")
-            print("Attempting alternative scanning method...")
-            # Fallback to os.walk for problematic directory structures
-            self._scan_with_walk(path, recursive, file_types)
+                        pending.get_nowait()
+                    except queue.Empty:
+                        break
+                for _ in range(workers):
+                    pending.put(None)
+
+    def _scan_single_directory(self, directory, recursive, file_types):
+        """
+        List one directory, returning its subdirectories and matching file entries
+
+        Args:
+            directory: Path of the directory to list
+            recursive: If True, collect subdirectories for further scanning
+            file_types: Frozenset of lowercase extensions to keep, or None for all
+
+        Returns:
+            Tuple of (subdirectory paths, (path, stat result) pairs of matching files)
+        """
+        subdirs = []
+        files = []
 
-    def _scan_with_walk(self, root_path, recursive, file_types):
-        """Alternative scanning method using os.walk for problematic directories"""
+        # DirEntry type checks use the d_type returned by the directory read,
+        # so only matching files are stat()ed. That happens here, on the
+        # scanning thread, so parallel scans overlap the stat round trips on
+        # network filesystems too. Symlinks are not followed.
         try:
-            if recursive:
-                for root, dirs, files in os.walk(str(root_path)):
-                    for file_name in files:
-                        file_path = Path(root) / file_name
-                        self._process_file(file_path, file_types)
-            else:
-                try:
-                    for item in os.listdir(str(root_path)):
-                        item_path = root_path / item
-                        if item_path.is_file():
-                            self._process_file(item_path, file_types)
-                except (OSError, IOError) as e:
-                    print(f"Warning: Could not list directory contents: {e}")
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            # Filter by file types if specified
+                            if (not file_types
+                                    or os.path.splitext(entry.name)[1].lower() in file_types):
+                                files.append((entry.path, entry.stat(follow_symlinks=False)))
+                    except (OSError, IOError) as e:
+                        print(f"Warning: Could not process {entry.path}: {e}")
         except (OSError, IOError, PermissionError) as e:
-            print(f"Warning: Could not scan with fallback method: {e}")
+            print(f"Warning: Could not scan directory {directory}: {e}")
+
+        return subdirs, files
 
-    def _process_file(self, file_path, file_types):
+    def _process_file(self, file_path, stat_result):
         """Process a single file with error handling"""
         try:
-            # Filter by file types if specified
-            if file_types:
-                if not any(file_path.suffix.lower() == ext.lower() for ext in file_types):
-                    return
-
-            file_info = FileInfo(file_path)
+            file_info = FileInfo(file_path, self.hash_algo, stat_result,
+                                 cacheable=self.cache is not None)
             self.files.append(file_info)
         except (OSError, IOError, UnicodeDecodeError, ValueError) as e:
             print(f"Warning: Could not process {file_path}: {e}")
 
-    def find_duplicates_by_content(self):
-        """Find duplicates based on file content hash"""
-        hash_groups = defaultdict(list)
+    def find_duplicates_by_content(self, verify=False):
+        """
+        Find duplicates based on file content hash
 
-        print("Calculating file hashes...")
-        for i, file_info in enumerate(self.files, 1):
-            print(f"\rProgress: {i}/{len(self.files)}", end="", flush=True)
+        Args:
+            verify: If True, confirm each hash group byte-by-byte and split
+                out any files that only collided on their hash
 
-            if file_info.hash:
-                hash_groups[file_info.hash].append(file_info)
+        Returns:
+            Dictionary mapping content hashes to lists of duplicate files
+        """
+        hash_groups = defaultdict(list)
 
-        print()  # New line
-        return {hash_val: files for hash_val, files in hash_groups.items() if len(files) > 1}
+        # Files with a unique size cannot have a duplicate, so only members
+        # of same-size groups are ever hashed
+        size_groups = list(self.find_duplicates_by_size().values())
+
+        # Reuse hashes from earlier runs for files that have not changed
+        uncached = set()
+        if self.cache is not None:
+            try:
+                uncached.update(self.cache.load(
+                    [file_info for files in size_groups for file_info in files]))
+            except sqlite3.Error as e:
+                self._disable_cache(e)
+
+        with ThreadPoolExecutor(max_workers=get_hash_workers()) as executor:
+            # Compute the head hashes in parallel before filtering. Cached
+            # groups are split too: the check is cheap and catches in-place
+            # edits the cache key missed
+            head_candidates = [file_info for files in size_groups for file_info in files]
+            if head_candidates:
+                print("Comparing leading blocks of same-size files...")
+                with ProgressReporter(len(head_candidates)) as progress:
+
+                    def hash_head(file_info):
+                        head_hash = file_info.head_hash
+                        progress.update()
+                        return head_hash
+
+                    list(executor.map(hash_head, head_candidates))
+                print()  # New line
+
+            # Hash small same-size files in waves to keep per-task overhead
+            # low; large files get a task each so they spread across threads
+            waves = []
+            for files in size_groups:
+                files = self._filter_by_head_hash(files)
+                if not files:
+                    continue
+                batch_size = HASH_BATCH_SIZE if files[0].size <= SMALL_FILE_SIZE else 1
+                for start in range(0, len(files), batch_size):
+                    waves.append(files[start:start + batch_size])
+
+            if waves:
+                print("Calculating file hashes...")
+                with ProgressReporter(sum(len(wave) for wave in waves)) as progress:
+
+                    def hash_wave(wave):
+                        hashes = [file_info.hash for file_info in wave]
+                        progress.update(len(wave))
+                        return hashes
+
+                    for wave, hashes in zip(waves, executor.map(hash_wave, waves)):
+                        for file_info, file_hash in zip(wave, hashes):
+                            if file_hash:
+                                hash_groups[file_hash].append(file_info)
+                print()  # New line
+
+        if self.cache is not None:
+            try:
+                self.cache.store([file_info for wave in waves for file_info in wave
+                                  if file_info in uncached])
+            except sqlite3.Error as e:
+                self._disable_cache(e)
+
+        duplicates = {hash_val: files for hash_val, files in hash_groups.items() if len(files) > 1}
+
+        if verify:
+            duplicates = self._verify_duplicates(duplicates)
+
+        return duplicates
+
+    def _verify_duplicates(self, duplicates):
+        """Split hash groups into groups of byte-identical files"""
+        print("Verifying duplicates byte-by-byte...")
+        verified = {}
+
+        for hash_val, files in duplicates.items():
+            remaining = files
+            subgroup = 0
+            while len(remaining) > 1:
+                reference, candidates = remaining[0], remaining[1:]
+                matches = self._matching_files(reference, candidates)
+                if matches:
+                    # Only a hash collision can produce a second subgroup
+                    key = hash_val if subgroup == 0 else f"{hash_val}#{subgroup}"
+                    verified[key] = [reference] + matches
+                    subgroup += 1
+                matched = set(map(id, matches))
+                remaining = [file_info for file_info in candidates if id(file_info) not in matched]
+
+        return verified
+
+    def _matching_files(self, reference, candidates):
+        """Return the candidates whose content is identical to reference"""
+        matches = []
+
+        # Compare in batches to bound the number of open files; within a
+        # batch every candidate is checked against each reference block
+        # while it is still hot in cache
+        for start in range(0, len(candidates), VERIFY_BATCH_SIZE):
+            batch = candidates[start:start + VERIFY_BATCH_SIZE]
+            try:
+                with ExitStack() as stack:
+                    ref = stack.enter_context(open(reference.path_str, "rb"))
+                    handles = []
+                    for file_info in batch:
+                        try:
+                            handles.append((file_info, stack.enter_context(open(file_info.path_str, "rb"))))
+                        except (IOError, OSError) as e:
+                            print(f"Warning: Could not read {file_info.path_str}: {e}")
+
+                    while handles:
+                        block = ref.read(VERIFY_BLOCK_SIZE)
+                        handles = [(file_info, f) for file_info, f in handles
+                                   if f.read(VERIFY_BLOCK_SIZE) == block]
+                        if not block:
+                            break
+
+                    matches.extend(file_info for file_info, f in handles)
+            except (IOError, OSError) as e:
+                print(f"Warning: Could not read {reference.path_str}: {e}")
+
+        return matches
+
+    def _filter_by_head_hash(self, files):
+        """Drop files whose leading block matches no other file in the group"""
+        head_groups = defaultdict(list)
+
+        for file_info in files:
+            if file_info.head_hash:
+                head_groups[file_info.head_hash].append(file_info)
+
+        return [file_info for group in head_groups.values() if len(group) > 1
+                for file_info in group]
 
     def find_duplicates_by_size(self):
         """Find duplicates based on file size"""
-        size_groups = defaultdict(list)
-
-        for file_info in self.files:
-            size_groups[file_info.size].append(file_info)
-
-        return {size: files for size, files in size_groups.items() if len(files) > 1}
+        return self._group_files("size")
 
     def find_duplicates_by_name(self):
         """Find duplicates based on filename"""
-        name_groups = defaultdict(list)
-
-        for file_info in self.files:
-            name_groups[file_info.name].append(file_info)
-
-        return {name: files for name, files in name_groups.items() if len(files) > 1}
+        return self._group_files("name")
 
     def find_duplicates_by_stem(self):
         """Find duplicates based on filename without extension"""
-        stem_groups = defaultdict(list)
+        return self._group_files("stem")
 
-        for file_info in self.files:
-            stem_groups[file_info.stem].append(file_info)
+    def _group_files(self, attribute):
+        """Group files sharing the same value of attribute, keeping groups of 2+"""
+        # Pull the key column out once, then count before grouping so that
+        # lists are only built for keys that repeat rather than for every file
+        keys = list(map(attrgetter(attribute), self.files))
+        counts = Counter(keys)
+        groups = {key: [] for key, count in counts.items() if count > 1}
 
-        return {stem: files for stem, files in stem_groups.items() if len(files) > 1}
+        for key, file_info in zip(keys, self.files):
+            group = groups.get(key)
+            if group is not None:
+                group.append(file_info)
+
+        return groups
 
     def move_duplicates(self, duplicates, destination_dir, keep_first=True, dry_run=False):
         """
@@ -195,31 +731,53 @@ class DuplicateFinder:
         print(f"Destination: {destination.absolute()}")
         print(f"Strategy: {'Keep first file' if keep_first else 'Move all files'}")
 
+        # Overlapping groups from different criteria can share files: never
+        # move a file twice, and never move a file another group kept
+        moved = set()
+        kept = set()
+
         for group_key, files in duplicates.items():
             if len(files) < 2:
                 continue
 
-            stats['moved_groups'] += 1
-            files_to_move = files[1:] if keep_first else files
-
             print(f"\nProcessing duplicate group: {group_key}")
-            if keep_first and len(files) > 1:
-                print(f"  Keeping: {files[0].path}")
+            if keep_first:
+                if files[0] in moved:
+                    # Moving the rest would leave no copy of this group behind
+                    print(f"  Skipping: kept file already moved: {files[0].path_str}")
+                    continue
+                kept.add(files[0])
+                print(f"  Keeping: {files[0].path_str}")
+
+            files_to_move = files[1:] if keep_first else files
+            group_moved = False
 
             for file_info in files_to_move:
+                if file_info in moved:
+                    print(f"  Already moved: {file_info.path_str}")
+                    continue
+                if file_info in kept:
+                    print(f"  Already kept: {file_info.path_str}")
+                    continue
+
                 try:
                     moved_successfully = self._move_single_file(
                         file_info, destination, dry_run, stats
                     )
                     if moved_successfully:
+                        moved.add(file_info)
+                        group_moved = True
                         stats['moved_files'] += 1
                         stats['total_space_freed'] += file_info.size
 
                 except Exception as e:
-                    error_msg = f"Error moving {file_info.path}: {e}"
+                    error_msg = f"Error moving {file_info.path_str}: {e}"
                     stats['errors'].append(error_msg)
                     print(f"  ERROR: {error_msg}")
 
+            if keep_first or group_moved:
+                stats['moved_groups'] += 1
+
         return stats
 
     def _move_single_file(self, file_info, destination_root, dry_run, stats):
@@ -263,11 +821,38 @@ class DuplicateFinder:
             print(f"    Renamed to avoid conflict: {destination_path.name}")
 
         try:
-            shutil.move(str(source_path), str(destination_path))
+            self._relocate_file(source_path, destination_path)
             return True
         except (OSError, IOError) as e:
             raise Exception(f"Could not move file: {e}")
 
+    def _relocate_file(self, source_path, destination_path):
+        """
+        Move a file, avoiding a byte-for-byte copy wherever the filesystem allows
+
+        Args:
+            source_path: Path of the file to move
+            destination_path: Path the file should end up at
+        """
+        # Within one filesystem a rename only touches metadata
+        if os.stat(source_path).st_dev == os.stat(destination_path.parent).st_dev:
+            try:
+                os.rename(source_path, destination_path)
+                return
+            except OSError as e:
+                # Bind mounts share a device but still refuse cross-mount renames
+                if e.errno != errno.EXDEV:
+                    raise
+
+        # Separate mounts of one copy-on-write filesystem (e.g. Btrfs
+        # subvolumes) can still share extents instead of copying the data
+        if clone_file(source_path, destination_path):
+            shutil.copystat(source_path, destination_path)
+            os.unlink(source_path)
+            return
+
+        shutil.move(str(source_path), str(destination_path))
+
     def _get_unique_filename(self, file_path):
         """
         Generate a unique filename by appending a number if the file already exists
@@ -310,6 +895,26 @@ def format_timestamp(timestamp):
     return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
 
 
+def merge_duplicate_groups(all_duplicates, duplicates, seen_groups):
+    """
+    Add duplicate groups to all_duplicates, skipping groups already added
+
+    Args:
+        all_duplicates: Dictionary of duplicate groups being collected for moving
+        duplicates: Dictionary of duplicate groups from a find_duplicates_* method
+        seen_groups: Set of identities of the groups merged so far, updated in place
+    """
+    for key, files in duplicates.items():
+        # A frozenset of the members identifies a group regardless of the
+        # criterion or order it was found in, so a group flagged by several
+        # criteria is only moved once
+        group_id = frozenset(files)
+        if group_id in seen_groups:
+            continue
+        seen_groups.add(group_id)
+        all_duplicates[key] = files
+
+
 def display_duplicates(duplicates, title, show_hash=False):
     """Display duplicate files in a formatted way"""
     if not duplicates:
@@ -341,8 +946,9 @@ def display_duplicates(duplicates, title, show_hash=False):
         for i, file_info in enumerate(files, 1):
             print(f"  [{i}] {file_info.path.absolute()}")
             print(f"      Modified: {format_timestamp(file_info.modified_time)}")
-            if file_info.mime_type:
-                print(f"      Type: {file_info.mime_type}")
+            mime_type = file_info.mime_type
+            if mime_type:
+                print(f"      Type: {mime_type}")
         print("-" * 40)
 
     print(f"\nSummary:")
@@ -401,6 +1007,27 @@ Examples:
         help="Run all duplicate detection methods"
     )
 
+    parser.add_argument(
+        "--hash-algo",
+        choices=sorted(HASH_ALGORITHM_PACKAGES),
+        default="sha256",
+        help="Hash algorithm for content comparison (default: sha256; "
+             "blake3 and xxh3 need the blake3/xxhash packages)"
+    )
+
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Confirm content duplicates byte-by-byte after hashing"
+    )
+
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Reuse content hashes of unchanged files between runs, stored in an "
+             "SQLite database at PATH (e.g. ~/.dupefinder/hashes.sqlite3)"
+    )
+
     parser.add_argument(
         "--types",
         nargs="+",
@@ -434,83 +1061,95 @@ Examples:
 
     args = parser.parse_args()
 
+    if args.hash_algo not in HASH_ALGORITHMS:
+        parser.error(f"--hash-algo {args.hash_algo} requires the "
+                     f"'{HASH_ALGORITHM_PACKAGES[args.hash_algo]}' package")
+
     # If no specific method is chosen, default to content-based detection
     if not any([args.by_content, args.by_size, args.by_name, args.by_stem, args.all]):
         args.by_content = True
 
-    # Initialize finder
-    finder = DuplicateFinder()
-
-    print(f"Scanning directory: {args.directory}")
-    if args.types:
-        print(f"Filtering file types: {', '.join(args.types)}")
-
-    # Scan directory
-    finder.scan_directory(
-        args.directory,
-        recursive=not args.no_recursive,
-        file_types=args.types
-    )
+    if args.verify and not (args.by_content or args.all):
+        parser.error("--verify requires --by-content or --all")
 
-    print(f"Found {len(finder.files)} files to analyze")
+    # Initialize finder
+    finder = DuplicateFinder(hash_algo=args.hash_algo, cache_path=args.cache)
+
+    try:
+        print(f"Scanning directory: {args.directory}")
+        if args.types:
+            print(f"Filtering file types: {', '.join(args.types)}")
+
+        # Scan directory
+        finder.scan_directory(
+            args.directory,
+            recursive=not args.no_recursive,
+            file_types=args.types
+        )
 
-    if not finder.files:
-        print("No files found to analyze")
-        return
+        print(f"Found {len(finder.files)} files to analyze")
 
-    # Find duplicates based on selected criteria
-    all_duplicates = {}
-
-    if args.all or args.by_content:
-        duplicates = finder.find_duplicates_by_content()
-        display_duplicates(duplicates, "DUPLICATES BY CONTENT", show_hash=True)
-        if args.move_to:
-            all_duplicates.update(duplicates)
-
-    if args.all or args.by_size:
-        duplicates = finder.find_duplicates_by_size()
-        display_duplicates(duplicates, "DUPLICATES BY SIZE")
-        if args.move_to and not args.by_content:  # Avoid duplicate moves
-            all_duplicates.update(duplicates)
-
-    if args.all or args.by_name:
-        duplicates = finder.find_duplicates_by_name()
-        display_duplicates(duplicates, "DUPLICATES BY FILENAME")
-        if args.move_to and not (args.by_content or args.by_size):
-            all_duplicates.update(duplicates)
-
-    if args.all or args.by_stem:
-        duplicates = finder.find_duplicates_by_stem()
-        display_duplicates(duplicates, "DUPLICATES BY FILENAME (without extension)")
-        if args.move_to and not (args.by_content or args.by_size or args.by_name):
-            all_duplicates.update(duplicates)
-
-    # Move duplicates if requested
-    if args.move_to and all_duplicates:
-        print(f"\n{'='*60}")
-        print("MOVING DUPLICATE FILES")
-        print(f"{'='*60}")
-
-        move_stats = finder.move_duplicates(
-            all_duplicates,
-            args.move_to,
-            keep_first=not args.move_all,
-            dry_run=args.dry_run
-        )
+        if not finder.files:
+            print("No files found to analyze")
+            return
 
-        print(f"\n{'='*60}")
-        print("MOVE OPERATION SUMMARY")
-        print(f"{'='*60}")
-        print(f"Duplicate groups processed: {move_stats['moved_groups']}")
-        print(f"Files moved: {move_stats['moved_files']}")
-        print(f"Space freed: {format_file_size(move_stats['total_space_freed'])}")
-
-        if move_stats['errors']:
-            print(f"\nErrors encountered ({len(move_stats['errors'])}):")
-            for error in move_stats['errors']:
-                print(f"  - {error}")
-    elif args.move_to:
-        print("\nNo duplicate files found to move.")
+        # Find duplicates based on selected criteria
+        all_duplicates = {}
+        seen_groups = set()
+
+        if args.all or args.by_content:
+            duplicates = finder.find_duplicates_by_content(verify=args.verify)
+            display_duplicates(duplicates, "DUPLICATES BY CONTENT", show_hash=True)
+            if args.move_to:
+                merge_duplicate_groups(all_duplicates, duplicates, seen_groups)
+
+        if args.all or args.by_size:
+            duplicates = finder.find_duplicates_by_size()
+            display_duplicates(duplicates, "DUPLICATES BY SIZE")
+            if args.move_to and not (args.all or args.by_content):  # Avoid duplicate moves
+                merge_duplicate_groups(all_duplicates, duplicates, seen_groups)
+
+        if args.all or args.by_name:
+            duplicates = finder.find_duplicates_by_name()
+            display_duplicates(duplicates, "DUPLICATES BY FILENAME")
+            if args.move_to and not (args.all or args.by_content or args.by_size):
+                merge_duplicate_groups(all_duplicates, duplicates, seen_groups)
+
+        if args.all or args.by_stem:
+            duplicates = finder.find_duplicates_by_stem()
+            display_duplicates(duplicates, "DUPLICATES BY FILENAME (without extension)")
+            if args.move_to and not (args.all or args.by_content or args.by_size
+                                     or args.by_name):
+                merge_duplicate_groups(all_duplicates, duplicates, seen_groups)
+
+        # Move duplicates if requested
+        if args.move_to and all_duplicates:
+            print(f"\n{'='*60}")
+            print("MOVING DUPLICATE FILES")
+            print(f"{'='*60}")
+
+            move_stats = finder.move_duplicates(
+                all_duplicates,
+                args.move_to,
+                keep_first=not args.move_all,
+                dry_run=args.dry_run
+            )
+
+            print(f"\n{'='*60}")
+            print("MOVE OPERATION SUMMARY")
+            print(f"{'='*60}")
+            print(f"Duplicate groups processed: {move_stats['moved_groups']}")
+            print(f"Files moved: {move_stats['moved_files']}")
+            print(f"Space freed: {format_file_size(move_stats['total_space_freed'])}")
+
+            if move_stats['errors']:
+                print(f"\nErrors encountered ({len(move_stats['errors'])}):")
+                for error in move_stats['errors']:
+                    print(f"  - {error}")
+        elif args.move_to:
+            print("\nNo duplicate files found to move.")
+    finally:
+        finder.close()
 
 
 if __name__ == "__main__":